@@ -1,7 +1,10 @@
 # https://claude.ai/chat/b6ef1e65-bf7d-4a3d-a2f6-b55a85dc329e
 import numpy as np
 import matplotlib.pyplot as plt
+import random
 import string
+import instrumentation
+from P3_SkipList_submit import IndexableSkipList
 
 class HashNode:
     def __init__(self, word, count=1):
@@ -10,10 +13,12 @@ class HashNode:
         self.next = None
 
 class WordCountHash:
-    def __init__(self, size):
+    def __init__(self, size, ranked=False):
         self.size = size
         self.table = [None] * size
         self.num_items = 0
+        # Optional index of (-count, word) kept in step with the counts, most frequent first
+        self.ranking = IndexableSkipList(max_level=20) if ranked else None
         
     def hash_function(self, word):
         """Multiplication method hash function."""
@@ -27,10 +32,16 @@ class WordCountHash:
     
     def insert(self, word, value=1):
         index = self.hash_function(word)
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["hash.insert"] += 1
         
         current = self.table[index]
         while current is not None:
+            if stats is not None:
+                stats["hash.chain_steps"] += 1
             if current.word == word:
+                self._rerank(word, current.count, value)
                 current.count = value
                 return
             current = current.next
@@ -39,19 +50,26 @@ class WordCountHash:
         new_node.next = self.table[index]
         self.table[index] = new_node
         self.num_items += 1
+        self._rerank(word, None, value)
     
     def delete(self, word):
         index = self.hash_function(word)
         current = self.table[index]
         prev = None
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["hash.delete"] += 1
         
         while current is not None:
+            if stats is not None:
+                stats["hash.chain_steps"] += 1
             if current.word == word:
                 if prev is None:
                     self.table[index] = current.next
                 else:
                     prev.next = current.next
                 self.num_items -= 1
+                self._rerank(word, current.count, None)
                 return True
             prev = current
             current = current.next
@@ -61,9 +79,15 @@ class WordCountHash:
         """Increase the count of a word by 1."""
         index = self.hash_function(word)
         current = self.table[index]
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["hash.increase"] += 1
         
         while current is not None:
+            if stats is not None:
+                stats["hash.chain_steps"] += 1
             if current.word == word:
+                self._rerank(word, current.count, current.count + 1)
                 current.count += 1
                 return True
             current = current.next
@@ -73,8 +97,13 @@ class WordCountHash:
         """Find the count of a word."""
         index = self.hash_function(word)
         current = self.table[index]
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["hash.find"] += 1
         
         while current is not None:
+            if stats is not None:
+                stats["hash.chain_steps"] += 1
             if current.word == word:
                 return current.count
             current = current.next
@@ -90,6 +119,43 @@ class WordCountHash:
                 current = current.next
         return sorted(result)  
 
+    def _rerank(self, word, old_count, new_count):
+        """Move word in the ranking index from old_count to new_count (None = absent)"""
+        if self.ranking is None:
+            return
+        if old_count is not None:
+            self.ranking.delete((-old_count, word))
+        if new_count is not None:
+            self.ranking.insert((-new_count, word))
+
+    def _require_ranking(self):
+        if self.ranking is None:
+            raise ValueError("WordCountHash was created without ranked=True")
+
+    def top_k(self, k):
+        """Return the k most frequent (word, count) pairs, ties by word."""
+        self._require_ranking()
+        keys = self.ranking.keys_from(self.ranking.header.forward[0], count=k)
+        return [(word, -neg_count) for neg_count, word in keys]
+
+    def rank_of(self, word):
+        """Return the 1-based frequency rank of a word, 0 if absent."""
+        self._require_ranking()
+        # Walk the chain rather than trust find(): a word can be stored with count 0
+        current = self.table[self.hash_function(word)]
+        while current is not None and current.word != word:
+            current = current.next
+        if current is None:
+            return 0
+        return self.ranking.rank((-current.count, word)) + 1
+
+    def words_in_count_range(self, low, high):
+        """Return (word, count) pairs with low <= count <= high, most frequent first."""
+        self._require_ranking()
+        # (-high,) sorts before every (-high, word); (-low + 1,) after every (-low, word)
+        keys = self.ranking.range_keys((-high,), (-low + 1,))
+        return [(word, -neg_count) for neg_count, word in keys]
+
     def get_collision_stats(self):
         """Return list of chain lengths for each bucket."""
         chain_lengths = []
@@ -172,8 +238,40 @@ def analyze_hash_distribution(hash_table):
     plt.ylabel('Number of Buckets')
     plt.show()
 
+def test_ranked_index():
+    """Check top_k, rank_of and words_in_count_range against a sort of list_all_keys"""
+    rng = random.Random(11)
+    words = [f"word{i}" for i in range(40)]
+    table = WordCountHash(13, ranked=True)
+    
+    for step in range(2000):
+        word = rng.choice(words)
+        op = rng.random()
+        if op < 0.5:
+            if not table.increase(word):
+                table.insert(word)
+        elif op < 0.65:
+            table.insert(word, rng.randint(0, 8))
+        elif op < 0.75:
+            table.delete(word)
+        
+        if step % 50:
+            continue
+        expected = sorted(table.list_all_keys(), key=lambda pair: (-pair[1], pair[0]))
+        for k in (0, 1, 5, len(expected) + 3):
+            assert table.top_k(k) == expected[:k]
+        for rank, (w, _) in enumerate(expected, 1):
+            assert table.rank_of(w) == rank
+        assert table.rank_of("missing") == 0
+        for low, high in [(0, 0), (1, 3), (2, 2), (5, 100), (4, 1)]:
+            assert table.words_in_count_range(low, high) == \
+                [pair for pair in expected if low <= pair[1] <= high]
+    print("Ranked index checks passed")
+
 # Example usage
 if __name__ == "__main__":
+    test_ranked_index()
+    
     # Process Alice in Wonderland with different table sizes
     for size in [30, 300, 1000]:
         print(f"\nAnalyzing with table size {size}:")
@@ -1,3 +1,5 @@
+import instrumentation
+
 class Node:
     def __init__(self, key):
         self.key = key
@@ -7,10 +9,11 @@ class Node:
         self.color = "RED" 
         
 class RedBlackTree:
-    def __init__(self):
+    def __init__(self, verbose=True):
         self.NIL = Node(None)  
         self.NIL.color = "BLACK"
         self.root = self.NIL
+        self.verbose = verbose
         
     def height(self, node=None):
         """Calculate the height"""
@@ -28,6 +31,9 @@ class RedBlackTree:
     
     def left_rotate(self, x):
         """maintain red-black properties"""
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["rbtree.rotations"] += 1
         y = x.right
         x.right = y.left
         
@@ -47,6 +53,9 @@ class RedBlackTree:
         x.parent = y
         
     def right_rotate(self, y):
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["rbtree.rotations"] += 1
         x = y.left
         y.left = x.right
         
@@ -73,8 +82,14 @@ class RedBlackTree:
         
         y = self.NIL
         x = self.root
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["rbtree.insert"] += 1
         
         while x != self.NIL:
+            if stats is not None:
+                stats["rbtree.comparisons"] += 1
+                stats["rbtree.hops"] += 1
             y = x
             if node.key < x.key:
                 x = x.left
@@ -82,6 +97,8 @@ class RedBlackTree:
                 x = x.right
                 
         node.parent = y
+        if stats is not None and y != self.NIL:
+            stats["rbtree.comparisons"] += 1
         
         if y == self.NIL:
             self.root = node
@@ -92,7 +109,8 @@ class RedBlackTree:
         
         # fix
         self.insert_fixup(node)
-        print(f"Current tree height after insertion: {self.height()}")
+        if self.verbose:
+            print(f"Current tree height after insertion: {self.height()}")
         
     def insert_fixup(self, z):
         """Fix red-black properties"""
@@ -132,13 +150,27 @@ class RedBlackTree:
         
     def search(self, key):
         """Search for a key"""
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["rbtree.search"] += 1
         result = self._search_recursive(self.root, key)
-        print(f"Current tree height: {self.height()}")
+        if self.verbose:
+            print(f"Current tree height: {self.height()}")
         return result != self.NIL
     
     def _search_recursive(self, node, key):
-        if node == self.NIL or key == node.key:
+        if node == self.NIL:
+            return node
+        
+        # One comparison for the equality test, one more to pick a side
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["rbtree.comparisons"] += 1
+        if key == node.key:
             return node
+        if stats is not None:
+            stats["rbtree.comparisons"] += 1
+            stats["rbtree.hops"] += 1
         
         if key < node.key:
             return self._search_recursive(node.left, key)
@@ -189,15 +221,20 @@ class RedBlackTree:
         """Return sorted list of all keys"""
         result = []
         self.inorder_traversal(self.root, result)
-        print(f"Current tree height: {self.height()}")
+        if self.verbose:
+            print(f"Current tree height: {self.height()}")
         return result
     
     def delete(self, key):
         """Delete a node with given key without RB fixup"""
         # Find the node to delete
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["rbtree.delete"] += 1
         z = self._search_recursive(self.root, key)
         if z == self.NIL:
-            print(f"Key {key} not found in tree")
+            if self.verbose:
+                print(f"Key {key} not found in tree")
             return
 
         # Case z has at most one child
@@ -225,8 +262,9 @@ class RedBlackTree:
         if y != z:
             z.key = y.key
 
-        print(f"Deleted {key} from tree")
-        print(f"Current tree height after deletion: {self.height()}")
+        if self.verbose:
+            print(f"Deleted {key} from tree")
+            print(f"Current tree height after deletion: {self.height()}")
     
 def print_tree(self, node=None, level=0, prefix="Root: "):
     """Print the tree structure"""
@@ -1,15 +1,27 @@
 import random
+import sys
+import threading
+import time
+import tracemalloc
+
+import instrumentation
 
 class Node:
+    # No per-node __dict__: a node is just its key and a forward list sized to its level
+    __slots__ = ('key', 'forward')
+
     def __init__(self, key, level):
         self.key = key
         self.forward = [None] * (level + 1)
 
 class SkipList:
-    def __init__(self, max_level=4, p=0.5):
+    node_type = Node
+
+    def __init__(self, max_level=4, p=0.5, verbose=True):
         self.max_level = max_level
         self.p = p
-        self.header = Node(float('-inf'), max_level)
+        self.verbose = verbose
+        self.header = self.node_type(float('-inf'), max_level)
         self.level = 0
 
     def random_level(self):
@@ -23,9 +35,19 @@ class SkipList:
         update = [None] * (self.max_level + 1)
         current = self.header
 
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["skiplist.insert"] += 1
+            stats["skiplist.levels"] += self.level + 1
         for i in range(self.level, -1, -1):
             while current.forward[i] and current.forward[i].key < key:
+                if stats is not None:
+                    stats["skiplist.comparisons"] += 1
+                    stats["skiplist.hops"] += 1
                 current = current.forward[i]
+            if stats is not None and current.forward[i]:
+                # The comparison that ended the walk on this level
+                stats["skiplist.comparisons"] += 1
             update[i] = current
 
         new_level = self.random_level()
@@ -36,25 +58,38 @@ class SkipList:
             self.level = new_level
 
         # Create new node
-        new_node = Node(key, new_level)
+        new_node = self.node_type(key, new_level)
 
         # Insert node by updating references
         for i in range(new_level + 1):
             new_node.forward[i] = update[i].forward[i]
             update[i].forward[i] = new_node
 
-        print(f"Inserted {key}")
+        if self.verbose:
+            print(f"Inserted {key}")
 
     def delete(self, key):
         update = [None] * (self.max_level + 1)
         current = self.header
 
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["skiplist.delete"] += 1
+            stats["skiplist.levels"] += self.level + 1
         for i in range(self.level, -1, -1):
             while current.forward[i] and current.forward[i].key < key:
+                if stats is not None:
+                    stats["skiplist.comparisons"] += 1
+                    stats["skiplist.hops"] += 1
                 current = current.forward[i]
+            if stats is not None and current.forward[i]:
+                # The comparison that ended the walk on this level
+                stats["skiplist.comparisons"] += 1
             update[i] = current
 
         current = current.forward[0]
+        if stats is not None and current:
+            stats["skiplist.comparisons"] += 1
 
         if current and current.key == key:
             for i in range(self.level + 1):
@@ -64,23 +99,38 @@ class SkipList:
 
             while self.level > 0 and self.header.forward[self.level] is None:
                 self.level -= 1
-            print(f"Deleted {key}")
-        else:
+            if self.verbose:
+                print(f"Deleted {key}")
+        elif self.verbose:
             print(f"Key {key} not found")
 
     def search(self, key):
         current = self.header
 
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["skiplist.search"] += 1
+            stats["skiplist.levels"] += self.level + 1
         for i in range(self.level, -1, -1):
             while current.forward[i] and current.forward[i].key < key:
+                if stats is not None:
+                    stats["skiplist.comparisons"] += 1
+                    stats["skiplist.hops"] += 1
                 current = current.forward[i]
+            if stats is not None and current.forward[i]:
+                # The comparison that ended the walk on this level
+                stats["skiplist.comparisons"] += 1
 
         current = current.forward[0]
+        if stats is not None and current:
+            stats["skiplist.comparisons"] += 1
 
         if current and current.key == key:
-            print(f"Found key {key}")
+            if self.verbose:
+                print(f"Found key {key}")
             return True
-        print(f"Key {key} not found")
+        if self.verbose:
+            print(f"Key {key} not found")
         return False
 
 
@@ -93,6 +143,290 @@ class SkipList:
                 print(f"({node.key})->", end="")
                 node = node.forward[level]
             print("None")
+
+
+class IndexedNode(Node):
+    # width[i] is how many level-0 steps forward[i] skips (to the virtual end when None)
+    __slots__ = ('width',)
+
+    def __init__(self, key, level):
+        super().__init__(key, level)
+        self.width = [1] * (level + 1)
+
+class IndexableSkipList(SkipList):
+    """Skip list with widths on every forward pointer, so rank and
+    position lookups take O(log n) as well as search. Keys must be unique."""
+    node_type = IndexedNode
+
+    def __init__(self, max_level=16, p=0.5):
+        super().__init__(max_level, p, verbose=False)
+        self.size = 0
+
+    def _find_update(self, key):
+        """Rightmost node before key on every level, with its 0-based position (header is -1)"""
+        update = [None] * (self.max_level + 1)
+        positions = [0] * (self.max_level + 1)
+        current = self.header
+        pos = -1
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["skiplist.levels"] += self.max_level + 1
+        for i in range(self.max_level, -1, -1):
+            while current.forward[i] and current.forward[i].key < key:
+                if stats is not None:
+                    stats["skiplist.comparisons"] += 1
+                    stats["skiplist.hops"] += 1
+                pos += current.width[i]
+                current = current.forward[i]
+            if stats is not None and current.forward[i]:
+                # The comparison that ended the walk on this level
+                stats["skiplist.comparisons"] += 1
+            update[i] = current
+            positions[i] = pos
+        return update, positions
+
+    def insert(self, key):
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["skiplist.insert"] += 1
+        update, positions = self._find_update(key)
+        new_level = self.random_level()
+        new_node = self.node_type(key, new_level)
+        pos = positions[0]
+
+        for i in range(new_level + 1):
+            skipped = pos - positions[i]
+            new_node.forward[i] = update[i].forward[i]
+            new_node.width[i] = update[i].width[i] - skipped
+            update[i].forward[i] = new_node
+            update[i].width[i] = skipped + 1
+        for i in range(new_level + 1, self.max_level + 1):
+            update[i].width[i] += 1
+
+        self.level = max(self.level, new_level)
+        self.size += 1
+
+    def delete(self, key):
+        """Delete key, return False if it is not present"""
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["skiplist.delete"] += 1
+        update, _ = self._find_update(key)
+        target = update[0].forward[0]
+        if stats is not None and target:
+            stats["skiplist.comparisons"] += 1
+        if not target or target.key != key:
+            return False
+
+        for i in range(self.max_level + 1):
+            if update[i].forward[i] is target:
+                update[i].forward[i] = target.forward[i]
+                update[i].width[i] += target.width[i] - 1
+            else:
+                update[i].width[i] -= 1
+
+        while self.level > 0 and self.header.forward[self.level] is None:
+            self.level -= 1
+        self.size -= 1
+        return True
+
+    def rank(self, key):
+        """Number of keys smaller than key"""
+        _, positions = self._find_update(key)
+        return positions[0] + 1
+
+    def select(self, index):
+        """Node at 0-based position index, or None"""
+        if not 0 <= index < self.size:
+            return None
+        current = self.header
+        pos = -1
+        for i in range(self.level, -1, -1):
+            while current.forward[i] and pos + current.width[i] <= index:
+                pos += current.width[i]
+                current = current.forward[i]
+        return current
+
+    def keys_from(self, node, count=None, stop=None):
+        """Walk level 0 from node, collecting up to count keys that are below stop"""
+        result = []
+        while node and (count is None or len(result) < count) and (stop is None or node.key < stop):
+            result.append(node.key)
+            node = node.forward[0]
+        return result
+
+    def range_keys(self, lo, hi):
+        """Keys k with lo <= k < hi, in order"""
+        update, _ = self._find_update(lo)
+        return self.keys_from(update[0].forward[0], stop=hi)
+
+class LazyNode:
+    __slots__ = ('key', 'forward', 'top_level', 'lock', 'marked', 'fully_linked')
+
+    def __init__(self, key, level):
+        self.key = key
+        self.forward = [None] * (level + 1)
+        self.top_level = level
+        self.lock = threading.RLock()
+        self.marked = False
+        self.fully_linked = False
+
+class ConcurrentSkipList:
+    """Lazy skip list (Herlihy et al.): per-node locks for insert/delete,
+    lock-free search. A node is logically present once fully_linked is set
+    and logically removed once marked, before it is physically unlinked."""
+
+    def __init__(self, max_level=16, p=0.5):
+        self.max_level = max_level
+        self.p = p
+        self.header = LazyNode(float('-inf'), max_level)
+        self.tail = LazyNode(float('inf'), max_level)
+        for i in range(max_level + 1):
+            self.header.forward[i] = self.tail
+        self.header.fully_linked = True
+        self.tail.fully_linked = True
+
+    def random_level(self):
+        level = 0
+        while random.random() < self.p and level < self.max_level:
+            level += 1
+        return level
+
+    def _find(self, key, preds, succs):
+        """Fill preds/succs for every level, return the highest level key was seen at or -1"""
+        found = -1
+        pred = self.header
+        for i in range(self.max_level, -1, -1):
+            current = pred.forward[i]
+            while current is not self.tail and current.key < key:
+                pred = current
+                current = pred.forward[i]
+            if found == -1 and current is not self.tail and current.key == key:
+                found = i
+            preds[i] = pred
+            succs[i] = current
+        return found
+
+    def insert(self, key):
+        """Insert key, return False if it is already present"""
+        top_level = self.random_level()
+        preds = [None] * (self.max_level + 1)
+        succs = [None] * (self.max_level + 1)
+
+        while True:
+            found = self._find(key, preds, succs)
+            if found != -1:
+                node = succs[found]
+                if not node.marked:
+                    # Another thread may still be linking it in
+                    while not node.fully_linked:
+                        time.sleep(0)
+                    return False
+                # Being removed, yield and retry once it is unlinked
+                time.sleep(0)
+                continue
+
+            locked = []
+            valid = True
+            try:
+                prev_pred = None
+                for i in range(top_level + 1):
+                    pred = preds[i]
+                    succ = succs[i]
+                    if pred is not prev_pred:
+                        pred.lock.acquire()
+                        locked.append(pred)
+                        prev_pred = pred
+                    valid = (not pred.marked and not succ.marked
+                             and pred.forward[i] is succ)
+                    if not valid:
+                        break
+                if not valid:
+                    continue
+
+                new_node = LazyNode(key, top_level)
+                for i in range(top_level + 1):
+                    new_node.forward[i] = succs[i]
+                for i in range(top_level + 1):
+                    preds[i].forward[i] = new_node
+                new_node.fully_linked = True
+                return True
+            finally:
+                for node in locked:
+                    node.lock.release()
+
+    def delete(self, key):
+        """Delete key, return False if it is not present"""
+        victim = None
+        is_marked = False
+        top_level = -1
+        preds = [None] * (self.max_level + 1)
+        succs = [None] * (self.max_level + 1)
+
+        while True:
+            found = self._find(key, preds, succs)
+            # Once marked, victim is the node whose lock this thread holds
+            if not is_marked and found != -1:
+                victim = succs[found]
+            if not is_marked and (found == -1 or not victim.fully_linked
+                                  or victim.top_level != found or victim.marked):
+                return False
+
+            if not is_marked:
+                top_level = victim.top_level
+                victim.lock.acquire()
+                if victim.marked:
+                    victim.lock.release()
+                    return False
+                victim.marked = True
+                is_marked = True
+
+            locked = []
+            valid = True
+            try:
+                prev_pred = None
+                for i in range(top_level + 1):
+                    pred = preds[i]
+                    if pred is not prev_pred:
+                        pred.lock.acquire()
+                        locked.append(pred)
+                        prev_pred = pred
+                    valid = not pred.marked and pred.forward[i] is victim
+                    if not valid:
+                        break
+                if not valid:
+                    continue
+
+                for i in range(top_level, -1, -1):
+                    preds[i].forward[i] = victim.forward[i]
+                victim.lock.release()
+                return True
+            finally:
+                for node in locked:
+                    node.lock.release()
+
+    def search(self, key):
+        """Wait-free membership test, takes no locks"""
+        pred = self.header
+        for i in range(self.max_level, -1, -1):
+            current = pred.forward[i]
+            while current is not self.tail and current.key < key:
+                pred = current
+                current = pred.forward[i]
+            if current is not self.tail and current.key == key:
+                return current.fully_linked and not current.marked
+        return False
+
+    def keys(self):
+        """Return present keys in order (not a consistent snapshot under writers)"""
+        result = []
+        node = self.header.forward[0]
+        while node is not self.tail:
+            if node.fully_linked and not node.marked:
+                result.append(node.key)
+            node = node.forward[0]
+        return result
+
 # Testing
 
 def test_detailed_structure():
@@ -110,6 +444,154 @@ def test_detailed_structure():
         print(f"\nAfter deleting {value}:")
         sl.display_detailed()
 
+def test_concurrent_stress(num_threads=8, ops_per_thread=20000, key_range=512):
+    """Run random insert/delete/search from several threads and check every result
+    against a sequential model. Each thread owns the keys k with k % num_threads == tid,
+    so operations on different threads commute and each thread's history must match
+    its own sequential set exactly."""
+    random.seed(42)
+    sl = ConcurrentSkipList()
+    models = [set() for _ in range(num_threads)]
+    errors = []
+    barrier = threading.Barrier(num_threads + 1)
+
+    def worker(tid):
+        rng = random.Random(tid)
+        model = models[tid]
+        own_keys = [k for k in range(key_range) if k % num_threads == tid]
+        barrier.wait()
+        for _ in range(ops_per_thread):
+            key = rng.choice(own_keys)
+            op = rng.random()
+            if op < 0.4:
+                expected = key not in model
+                model.add(key)
+                got = sl.insert(key)
+            elif op < 0.7:
+                expected = key in model
+                model.discard(key)
+                got = sl.delete(key)
+            else:
+                expected = key in model
+                got = sl.search(key)
+            if got != expected:
+                errors.append((tid, op, key, expected, got))
+
+    threads = [threading.Thread(target=worker, args=(tid,)) for tid in range(num_threads)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    expected_keys = sorted(set().union(*models))
+    assert not errors, f"{len(errors)} non-linearizable results, first: {errors[0]}"
+    assert sl.keys() == expected_keys, "final contents differ from sequential model"
+
+    total_ops = num_threads * ops_per_thread
+    print(f"\nConcurrent stress: {num_threads} threads, {total_ops} ops "
+          f"in {elapsed:.2f}s ({total_ops / elapsed:.0f} ops/sec), {len(expected_keys)} keys left")
+
+def test_concurrent_contended(num_threads=8, ops_per_thread=20000, key_range=16):
+    """All threads hammer the same few keys so inserts wait on fully_linked,
+    find marked nodes and fail lock validation. Per key, successful inserts minus
+    successful deletes must be 0 or 1 and match the final contents, and no marked
+    or half-linked node may remain reachable on any level."""
+    sl = ConcurrentSkipList(max_level=4)
+    inserted = [[0] * key_range for _ in range(num_threads)]
+    deleted = [[0] * key_range for _ in range(num_threads)]
+    barrier = threading.Barrier(num_threads)
+
+    def worker(tid):
+        rng = random.Random(100 + tid)
+        barrier.wait()
+        for _ in range(ops_per_thread):
+            key = rng.randrange(key_range)
+            op = rng.random()
+            if op < 0.4:
+                if sl.insert(key):
+                    inserted[tid][key] += 1
+            elif op < 0.8:
+                if sl.delete(key):
+                    deleted[tid][key] += 1
+            else:
+                sl.search(key)
+
+    # Switch threads far more often than the default 5ms so operations interleave
+    old_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=worker, args=(tid,)) for tid in range(num_threads)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        sys.setswitchinterval(old_interval)
+
+    expected_keys = []
+    for key in range(key_range):
+        net = sum(inserted[tid][key] - deleted[tid][key] for tid in range(num_threads))
+        assert net in (0, 1), f"key {key}: {net} more successful inserts than deletes"
+        if net:
+            expected_keys.append(key)
+    assert sl.keys() == expected_keys, "final contents differ from insert/delete counts"
+
+    for level in range(sl.max_level + 1):
+        node = sl.header.forward[level]
+        prev_key = float('-inf')
+        while node is not sl.tail:
+            assert not node.marked, f"marked node {node.key} still linked at level {level}"
+            assert node.fully_linked, f"node {node.key} reachable before fully linked"
+            assert node.key > prev_key, f"level {level} out of order at {node.key}"
+            prev_key = node.key
+            node = node.forward[level]
+
+    total_ops = num_threads * ops_per_thread
+    successes = sum(map(sum, inserted)) + sum(map(sum, deleted))
+    print(f"\nContended stress: {num_threads} threads on {key_range} keys, {total_ops} ops "
+          f"in {elapsed:.2f}s, {successes} successful updates, {len(expected_keys)} keys left")
+
+def benchmark_node_layout(n=10**6, searches=10**5, max_level=20, seed=7):
+    """Compare bytes-per-key and search throughput of the slotted Node against
+    the previous __dict__-based node layout. Returns {layout: measurements}."""
+
+    class DictNode:
+        def __init__(self, key, level):
+            self.key = key
+            self.forward = [None] * (level + 1)
+
+    class DictSkipList(SkipList):
+        node_type = DictNode
+
+    rng = random.Random(seed)
+    keys = rng.sample(range(n * 10), n)
+    probes = [rng.choice(keys) for _ in range(searches)]
+
+    print(f"\nNode layout benchmark, {n} keys, {searches} searches:")
+    results = {}
+    for name, cls in [("dict Node", DictSkipList), ("slotted Node", SkipList)]:
+        random.seed(seed)
+        tracemalloc.start()
+        sl = cls(max_level=max_level, verbose=False)
+        for key in keys:
+            sl.insert(key)
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for key in probes:
+            sl.search(key)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:>12}: {used / n:.1f} bytes/key, {searches / elapsed:.0f} searches/sec")
+        results[name] = {"bytes_per_key": used / n, "searches_per_sec": searches / elapsed}
+        del sl
+    return results
+
 # def test_search_functionality():
 #     # Set seed for reproducible random levels
 #     random.seed(42)
@@ -143,4 +625,6 @@ def test_detailed_structure():
 if __name__ == "__main__":
 
     test_detailed_structure()
+    test_concurrent_stress()
+    test_concurrent_contended()
     # test_search_functionality()
\ No newline at end of file
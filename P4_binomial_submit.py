@@ -1,19 +1,42 @@
+import heapq
+import random
+import time
+
+import instrumentation
+
 class BinomialNode:
-    def __init__(self, key):
+    def __init__(self, key, item=None):
         self.key = key
+        self.item = item
         self.degree = 0
         self.parent = None
         self.child = None
         self.sibling = None
+        # Set once the node leaves its heap, so stale handles are rejected
+        self.removed = False
 
 class BinomialHeap:
-    def __init__(self):
+    def __init__(self, lazy=False, indexed=False):
         self.head = None
+        self.size = 0
+        # Optional item -> node index so decrease_key/delete can be called by item
+        self.index = {} if indexed else None
+        # Root holding the minimum key, kept current so minimum() is O(1)
+        self.min_node = None
+        # Lazy mode only prepends on insert and consolidates in extract_min
+        self.lazy = lazy
     
     def _merge_binomial_trees(self, b1, b2):
         """Merge two binomial trees of same degree"""
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["binomial.links"] += 1
+            stats["binomial.comparisons"] += 1
         if b1.key > b2.key:
             b1, b2 = b2, b1
+        if b2 is self.min_node:
+            # Equal keys: the surviving root holds the same minimum
+            self.min_node = b1
         
         b2.parent = b1
         b2.sibling = b1.child
@@ -38,9 +61,12 @@ class BinomialHeap:
             h2 = h2.sibling
         
         current = result
+        stats = instrumentation.counters
         
         # Merge remaining nodes
         while h1 and h2:
+            if stats is not None:
+                stats["binomial.root_hops"] += 1
             if h1.degree <= h2.degree:
                 current.sibling = h1
                 h1 = h1.sibling
@@ -60,11 +86,15 @@ class BinomialHeap:
         next_x = x.sibling
         
         while next_x:
+            if stats is not None:
+                stats["binomial.root_hops"] += 1
             if (x.degree != next_x.degree) or \
                (next_x.sibling and next_x.sibling.degree == x.degree):
                 prev = x
                 x = next_x
             else:
+                if stats is not None:
+                    stats["binomial.comparisons"] += 1
                 if x.key <= next_x.key:
                     x.sibling = next_x.sibling
                     self._merge_binomial_trees(x, next_x)
@@ -79,101 +109,345 @@ class BinomialHeap:
             
         return result
     
-    def insert(self, key):
-        """Insert a new key """
-        new_node = BinomialNode(key)
-        if not self.head:
-            self.head = new_node
-        else:
-            temp = BinomialHeap()
-            temp.head = new_node
-            self.head = self._union_binomial_heaps(self.head, temp.head)
+    def _consolidate(self, head, trees=None):
+        """Link a root list of any order into one tree per degree, like binary counter increments.
+        Returns the new root list in increasing degree order and sets min_node. A degree
+        table passed in as trees is left empty again so callers can reuse it"""
+        if trees is None:
+            trees = []
+        # Every node's sibling is rewritten below, either by linking or by the rebuild
+        node = head
+        while node:
+            next_node = node.sibling
+            degree = node.degree
+            while degree >= len(trees):
+                trees.append(None)
+            while trees[degree]:
+                node = self._merge_binomial_trees(node, trees[degree])
+                trees[degree] = None
+                degree += 1
+                if degree == len(trees):
+                    trees.append(None)
+            trees[degree] = node
+            node = next_node
+
+        result = None
+        min_node = None
+        stats = instrumentation.counters
+        for degree in range(len(trees) - 1, -1, -1):
+            tree = trees[degree]
+            if tree:
+                trees[degree] = None
+                tree.sibling = result
+                result = tree
+                if stats is not None and min_node is not None:
+                    stats["binomial.comparisons"] += 1
+                if min_node is None or tree.key < min_node.key:
+                    min_node = tree
+        self.min_node = min_node
+        return result
+
+    def _update_min(self):
+        """Rescan the root list for the minimum root"""
+        self.min_node = None
+        current = self.head
+        stats = instrumentation.counters
+        while current:
+            if stats is not None:
+                stats["binomial.root_hops"] += 1
+                if self.min_node is not None:
+                    stats["binomial.comparisons"] += 1
+            if self.min_node is None or current.key < self.min_node.key:
+                self.min_node = current
+            current = current.sibling
+
+    def insert(self, key, item=None):
+        """Insert a new key, amortized O(1): only equal-degree roots at the front are linked.
+        Returns the node, a handle that stays valid for decrease_key/delete"""
+        if self.index is not None:
+            if item is None:
+                raise ValueError("an indexed BinomialHeap needs an item for every key")
+            if item in self.index:
+                raise ValueError(f"item {item!r} is already in the heap")
+        handle = BinomialNode(key, item)
+        if self.index is not None:
+            self.index[item] = handle
+        node = handle
+        self.size += 1
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["binomial.insert"] += 1
+        node.sibling = self.head
+        while not self.lazy and node.sibling and node.sibling.degree == node.degree:
+            rest = node.sibling.sibling
+            node = self._merge_binomial_trees(node, node.sibling)
+            node.sibling = rest
+        self.head = node
+        if stats is not None and self.min_node is not None:
+            stats["binomial.comparisons"] += 1
+        if self.min_node is None or node.key < self.min_node.key:
+            self.min_node = node
+        return handle
     
     def minimum(self):
-        """Find the minimum key """
-        if not self.head:
+        """Find the minimum key in O(1)"""
+        if not self.min_node:
             return float('inf')
-        
-        min_key = self.head.key
-        current = self.head.sibling
-        
-        while current:
-            if current.key < min_key:
-                min_key = current.key
-            current = current.sibling
-            
-        return min_key
+        return self.min_node.key
     
     def extract_min(self):
         """Extract the minimum key"""
         if not self.head:
             return float('inf')
+        return self.extract_min_node().key
+    
+    def extract_min_node(self):
+        """Extract the node with the minimum key, giving access to its item"""
+        if not self.head:
+            return None
+        min_node = self.min_node
+        self._remove_root(min_node)
+        return min_node
+    
+    def extract_many(self, k):
+        """Extract up to k smallest keys in ascending order. The batch reuses one degree
+        table for every consolidation; it saves allocations, not time, over repeated extract_min"""
+        result = []
+        trees = [None] * (self.size.bit_length() + 1)
+        while self.head and len(result) < k:
+            root = self.min_node
+            self._remove_root(root, trees)
+            result.append(root.key)
+        return result
+    
+    def drain(self):
+        """Yield keys in ascending order, emptying the heap as it goes (heap sort).
+        Shares one degree table across the whole drain, like extract_many"""
+        trees = [None] * (self.size.bit_length() + 1)
+        while self.head:
+            root = self.min_node
+            self._remove_root(root, trees)
+            yield root.key
+    
+    def _remove_root(self, root, trees=None):
+        """Unlink a root and merge its children back into the heap"""
+        self.min_node = None
+        self.size -= 1
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["binomial.remove_root"] += 1
+        if self.index is not None:
+            self.index.pop(root.item, None)
         
-        min_node = self.head
-        min_prev = None
-        current = self.head.sibling
-        prev = self.head
+        if self.head is root:
+            self.head = root.sibling
+        else:
+            prev = self.head
+            while prev.sibling is not root:
+                if stats is not None:
+                    stats["binomial.root_hops"] += 1
+                prev = prev.sibling
+            prev.sibling = root.sibling
         
-        # Find minimum node
-        while current:
-            if current.key < min_node.key:
-                min_node = current
-                min_prev = prev
-            prev = current
-            current = current.sibling
+        if self.lazy or trees is not None:
+            # Splice the children onto the root list, then consolidate everything in one pass
+            child = root.child
+            while child:
+                next_child = child.sibling
+                child.parent = None
+                child.sibling = self.head
+                self.head = child
+                child = next_child
+            self.head = self._consolidate(self.head, trees)
+        else:
+            # Reverse the order of root's children
+            new_head = None
+            child = root.child
+            
+            while child:
+                next_child = child.sibling
+                child.sibling = new_head
+                child.parent = None
+                new_head = child
+                child = next_child
+            
+            if new_head:
+                self.head = self._union_binomial_heaps(self.head, new_head)
+            self._update_min()
+        
+        root.sibling = root.child = None
+        root.degree = 0
+        root.removed = True
+    
+    def meld(self, other):
+        """Destructively union other into this heap; other is left empty.
+        Two strict heaps meld in O(log n). A lazy other melded into a strict heap is
+        consolidated first, and a lazy self walks other's root list, both O(roots of other).
+        With an index, checking and copying other's items adds O(len(other))"""
+        if other is self:
+            return
+        if (self.index is None) != (other.index is None):
+            raise ValueError("cannot meld an indexed heap with a non-indexed one")
+        if not other.head:
+            return
+        if self.index is not None and not self.index.keys().isdisjoint(other.index):
+            raise ValueError("cannot meld heaps that share indexed items")
         
-        # Remove minimum node
-        if min_prev:
-            min_prev.sibling = min_node.sibling
+        if other.lazy and not self.lazy:
+            other.head = other._consolidate(other.head)
+        stats = instrumentation.counters
+        if stats is not None and other.min_node and self.min_node:
+            stats["binomial.comparisons"] += 1
+        if other.min_node and (self.min_node is None or other.min_node.key < self.min_node.key):
+            self.min_node = other.min_node
+        if self.lazy:
+            # Splice other's root list in front, consolidation waits for extract_min
+            tail = other.head
+            while tail.sibling:
+                tail = tail.sibling
+            tail.sibling = self.head
+            self.head = other.head
         else:
-            self.head = min_node.sibling
+            self.head = self._union_binomial_heaps(self.head, other.head)
         
-        # Reverse the order of min_node's children
-        new_head = None
-        child = min_node.child
+        self.size += other.size
+        if self.index is not None and other.index:
+            self.index.update(other.index)
         
-        while child:
-            next_child = child.sibling
-            child.sibling = new_head
-            child.parent = None
-            new_head = child
-            child = next_child
+        other.head = None
+        other.min_node = None
+        other.size = 0
+        if other.index is not None:
+            other.index = {}
+    
+    def _swap_with_parent(self, node):
+        """Relink node into its parent's position and the parent into node's,
+        so handles keep pointing at their own key and item"""
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["binomial.swaps"] += 1
+        parent = node.parent
+        grandparent = parent.parent
+        
+        # Predecessors of parent among its siblings and of node among parent's children
+        first = grandparent.child if grandparent else self.head
+        parent_prev = None
+        if first is not parent:
+            parent_prev = first
+            while parent_prev.sibling is not parent:
+                parent_prev = parent_prev.sibling
+        node_prev = None
+        if parent.child is not node:
+            node_prev = parent.child
+            while node_prev.sibling is not node:
+                node_prev = node_prev.sibling
+        
+        node_child, node_sibling = node.child, node.sibling
+        parent_sibling = parent.sibling
         
-        # Create a new heap with reversed children
-        if new_head:
-            temp = BinomialHeap()
-            temp.head = new_head
-            self.head = self._union_binomial_heaps(self.head, temp.head)
+        # node takes over parent's children, with parent in node's old slot
+        if node_prev:
+            node_prev.sibling = parent
+            node.child = parent.child
+        else:
+            node.child = parent
+        parent.sibling = node_sibling
+        parent.child = node_child
+        
+        # node takes parent's slot in the parent level
+        node.sibling = parent_sibling
+        node.parent = grandparent
+        if parent_prev:
+            parent_prev.sibling = node
+        elif grandparent:
+            grandparent.child = node
+        else:
+            self.head = node
         
-        return min_node.key
+        node.degree, parent.degree = parent.degree, node.degree
+        child = node.child
+        while child:
+            child.parent = node
+            child = child.sibling
+        child = parent.child
+        while child:
+            child.parent = parent
+            child = child.sibling
+    
+    def _lookup(self, node):
+        """Accept a node handle, or an item when the heap is indexed"""
+        if isinstance(node, BinomialNode):
+            if node.removed:
+                raise ValueError(f"node with key {node.key!r} was already removed from the heap")
+            return node
+        if self.index is None:
+            raise ValueError("BinomialHeap was created without indexed=True, pass a node handle")
+        if node not in self.index:
+            raise ValueError(f"item {node!r} is not in the heap")
+        return self.index[node]
     
     def decrease_key(self, node, new_key):
-        """Decrease the key value """
+        """Decrease the key value of a node handle (or item, if indexed)"""
+        node = self._lookup(node)
+        stats = instrumentation.counters
+        if stats is not None:
+            stats["binomial.decrease_key"] += 1
+            stats["binomial.comparisons"] += 1
         if new_key > node.key:
             return
         
         node.key = new_key
-        current = node
-        parent = current.parent
+        while node.parent and node.key < node.parent.key:
+            if stats is not None:
+                stats["binomial.comparisons"] += 1
+            self._swap_with_parent(node)
         
-        while parent and current.key < parent.key:
-            current.key, parent.key = parent.key, current.key
-            current = parent
-            parent = current.parent
+        if stats is not None:
+            # The failed comparison with the parent, or the comparison with the minimum
+            stats["binomial.comparisons"] += 1
+        if node.parent is None and node.key < self.min_node.key:
+            self.min_node = node
     
     def delete(self, node):
-        """Delete a node """
-        self.decrease_key(node, float('-inf'))
-        self.extract_min()
+        """Delete a node handle (or item, if indexed)"""
+        node = self._lookup(node)
+        while node.parent:
+            self._swap_with_parent(node)
+        self._remove_root(node)
     
     @staticmethod
-    def make_heap(keys):
-        """Create a binomial heap from a list of keys"""
-        heap = BinomialHeap()
-        for key in keys:
-            heap.insert(key)
+    def make_heap(keys, lazy=False):
+        """Create a binomial heap from a list of keys in O(n)"""
+        heap = BinomialHeap(lazy)
+        head = None
+        keys = list(keys)
+        for key in reversed(keys):
+            node = BinomialNode(key)
+            node.sibling = head
+            head = node
+        heap.head = heap._consolidate(head)
+        heap.size = len(keys)
         return heap
     
+    @staticmethod
+    def merge_sorted(*iterables):
+        """Stream the k-way merge of sorted iterables, keeping one head per iterable in the heap"""
+        heap = BinomialHeap()
+        for iterable in iterables:
+            shard = BinomialHeap()
+            iterator = iter(iterable)
+            for key in iterator:
+                shard.insert(key, iterator)
+                break
+            heap.meld(shard)
+        
+        while heap.head:
+            node = heap.extract_min_node()
+            yield node.key
+            for key in node.item:
+                heap.insert(key, node.item)
+                break
+    
     def display(self):
         """Display the heap structure """
         def display_tree(node, level=0):
@@ -185,6 +459,163 @@ class BinomialHeap:
         
         display_tree(self.head)
 
+def dijkstra(graph, source):
+    """Shortest distances from source, graph is a list of [(neighbor, weight), ...]"""
+    dist = {source: 0}
+    heap = BinomialHeap(indexed=True)
+    heap.insert(0, source)
+    while heap.head:
+        node = heap.extract_min_node()
+        u, d = node.item, node.key
+        for v, w in graph[u]:
+            nd = d + w
+            if v not in dist:
+                dist[v] = nd
+                heap.insert(nd, v)
+            elif nd < dist[v]:
+                dist[v] = nd
+                heap.decrease_key(v, nd)
+    return dist
+
+def dijkstra_heapq(graph, source):
+    """Reference Dijkstra using heapq with lazy deletion of stale entries"""
+    dist = {source: 0}
+    done = set()
+    queue = [(0, source)]
+    while queue:
+        d, u = heapq.heappop(queue)
+        if u in done:
+            continue
+        done.add(u)
+        for v, w in graph[u]:
+            nd = d + w
+            if v not in dist or nd < dist[v]:
+                dist[v] = nd
+                heapq.heappush(queue, (nd, v))
+    return dist
+
+def benchmark_dijkstra(n=10**5, avg_degree=8, seed=1):
+    """Compare Dijkstra on a random sparse graph using BinomialHeap vs heapq.
+    Returns {heap: seconds}"""
+    rng = random.Random(seed)
+    graph = [[] for _ in range(n)]
+    for u in range(n):
+        for _ in range(avg_degree):
+            graph[u].append((rng.randrange(n), rng.randint(1, 1000)))
+    
+    print(f"\nDijkstra benchmark, {n} vertices, {n * avg_degree} edges:")
+    results = []
+    seconds = {}
+    for name, run in [("BinomialHeap", dijkstra), ("heapq", dijkstra_heapq)]:
+        start = time.perf_counter()
+        results.append(run(graph, 0))
+        seconds[name] = time.perf_counter() - start
+        print(f"  {name:>12}: {seconds[name]:.2f}s")
+    assert results[0] == results[1], "distance mismatch"
+    return seconds
+
+def test_indexed_handles():
+    """Handles keep their key and item through decrease_key/delete, and the index rejects bad items"""
+    heap = BinomialHeap(indexed=True)
+    handles = {item: heap.insert(key, item) for item, key in enumerate([10, 1, 6, 12, 25, 18, 8, 14])}
+    heap.decrease_key(handles[4], 0)
+    heap.decrease_key(7, 2)
+    heap.delete(2)
+    assert handles[4].key == 0 and handles[4].item == 4
+    assert handles[7].key == 2 and handles[7].item == 7
+    assert [heap.extract_min_node().item for _ in range(heap.size)] == [4, 1, 7, 6, 0, 3, 5]
+    
+    for bad_item in (None, 3):
+        heap.insert(1, 3)
+        try:
+            heap.insert(2, bad_item)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"indexed insert accepted item {bad_item!r}")
+        heap.delete(3)
+    try:
+        BinomialHeap().decrease_key(3, 0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("decrease_key by item on a non-indexed heap")
+    
+    # Extracted handles and unknown items are rejected, and the heap stays usable
+    plain = BinomialHeap()
+    stale = plain.insert(3)
+    plain.insert(4)
+    plain.extract_min()
+    for misuse in (lambda: plain.decrease_key(stale, 0), lambda: plain.delete(stale),
+                   lambda: heap.decrease_key("missing", 0), lambda: heap.delete("missing")):
+        try:
+            misuse()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("stale handle or unknown item accepted")
+    assert plain.minimum() == 4 and plain.extract_min() == 4
+    print("\nIndexed handle checks passed")
+
+def test_meld_and_merge_sorted():
+    """merge_sorted matches sorted(), and melding a lazy heap into a strict one keeps a root min"""
+    rng = random.Random(5)
+    shards = [sorted(rng.randint(0, 50) for _ in range(rng.randint(0, 40))) for _ in range(6)]
+    assert list(BinomialHeap.merge_sorted(*shards)) == sorted(sum(shards, []))
+    assert list(BinomialHeap.merge_sorted()) == []
+    
+    for _ in range(200):
+        # Few distinct keys, so consolidating the lazy heap links equal-key roots
+        strict_keys = [rng.randint(0, 3) for _ in range(rng.randint(0, 20))]
+        lazy_keys = [rng.randint(0, 3) for _ in range(rng.randint(2, 20))]
+        strict = BinomialHeap.make_heap(strict_keys)
+        lazy = BinomialHeap(lazy=True)
+        for key in lazy_keys:
+            lazy.insert(key)
+        # An extraction consolidates the lazy roots, leaving equal-key roots behind the cached min
+        lazy_keys.remove(lazy.extract_min())
+        for key in lazy_keys[:5]:
+            lazy.insert(key)
+        lazy_keys += lazy_keys[:5]
+        strict.meld(lazy)
+        assert lazy.size == 0 and lazy.head is None
+        assert strict.size == len(strict_keys) + len(lazy_keys)
+        assert strict.min_node.parent is None
+        assert [strict.extract_min() for _ in range(strict.size)] == sorted(strict_keys + lazy_keys)
+    
+    indexed = BinomialHeap(indexed=True)
+    indexed.insert(1, "x")
+    plain = BinomialHeap()
+    plain.insert(2)
+    for target, source in ((indexed, plain), (plain, indexed)):
+        try:
+            target.meld(source)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("melded an indexed heap with a non-indexed one")
+    assert indexed.size == 1 and plain.size == 1
+    print("\nMeld and merge_sorted checks passed")
+
+def test_extract_many_and_drain():
+    """extract_many(k) and drain() give sorted(keys) on strict and lazy heaps"""
+    rng = random.Random(9)
+    for lazy in (False, True):
+        for _ in range(100):
+            keys = [rng.randint(0, 30) for _ in range(rng.randint(0, 60))]
+            k = rng.randint(0, len(keys) + 5)
+            heap = BinomialHeap.make_heap(keys, lazy)
+            assert heap.extract_many(k) == sorted(keys)[:k]
+            assert heap.size == max(0, len(keys) - k)
+            assert list(heap.drain()) == sorted(keys)[k:]
+            
+            heap = BinomialHeap(lazy)
+            for key in keys:
+                heap.insert(key)
+            assert list(heap.drain()) == sorted(keys)
+            assert heap.size == 0 and heap.head is None
+    print("\nextract_many and drain checks passed")
+
 # Test 
 if __name__ == "__main__":
     # Create heap 
@@ -204,4 +635,8 @@ if __name__ == "__main__":
     # Insert a new key
     heap.insert(5)
     print("\nHeap structure after inserting 5:")
-    heap.display()
\ No newline at end of file
+    heap.display()
+    
+    test_indexed_handles()
+    test_meld_and_merge_sorted()
+    test_extract_many_and_drain()
@@ -0,0 +1,322 @@
+"""Benchmark harness for the four data-structure modules and their stdlib baselines.
+
+Usage:
+    python benchmark.py --sizes 1000 10000 100000 --seed 42 --output bench.json
+
+Every (structure, size) case is built from a fixed seed, timed per operation with
+perf_counter_ns, and reported as ops/sec, latency percentiles and peak memory in JSON.
+"""
+import argparse
+import bisect
+import contextlib
+import heapq
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import instrumentation
+from P1_hash_submit import WordCountHash
+from P2_RedBlackTree_submit import RedBlackTree
+from P3_SkipList_submit import SkipList, benchmark_node_layout
+from P4_binomial_submit import BinomialHeap, benchmark_dijkstra
+
+def summarize(latencies):
+    """Turn per-operation latencies (ns) into throughput and percentiles"""
+    latencies.sort()
+    n = len(latencies)
+    total = sum(latencies) or 1
+
+    def percentile(p):
+        return latencies[min(n - 1, int(p / 100 * n))]
+
+    return {
+        "ops": n,
+        "ops_per_sec": n / (total / 1e9),
+        "p50_ns": percentile(50),
+        "p90_ns": percentile(90),
+        "p99_ns": percentile(99),
+        "max_ns": latencies[-1],
+    }
+
+def time_ops(op, args):
+    """Call op once per argument and time each call"""
+    clock = time.perf_counter_ns
+    latencies = []
+    for arg in args:
+        start = clock()
+        op(arg)
+        latencies.append(clock() - start)
+    return summarize(latencies)
+
+def time_once(op):
+    """Time a single whole-structure operation such as sort"""
+    return time_ops(lambda _: op(), [None])
+
+def peak_memory(build, keys):
+    """Peak bytes allocated while building the structure from keys"""
+    tracemalloc.start()
+    structure = build(keys)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del structure
+    return peak
+
+# Workloads: each takes (keys, probes, rng) and returns {operation: stats}
+
+def build_hash(keys):
+    table = WordCountHash(len(keys))
+    for word in keys:
+        if table.find(word) > 0:
+            table.increase(word)
+        else:
+            table.insert(word)
+    return table
+
+def bench_hash(keys, probes, rng):
+    table = WordCountHash(len(keys))
+
+    def ingest(word):
+        if table.find(word) > 0:
+            table.increase(word)
+        else:
+            table.insert(word)
+
+    return {
+        "ingest": time_ops(ingest, keys),
+        "find": time_ops(table.find, probes),
+        "delete": time_ops(table.delete, probes),
+    }
+
+def build_dict(keys):
+    counts = {}
+    for word in keys:
+        counts[word] = counts.get(word, 0) + 1
+    return counts
+
+def bench_dict(keys, probes, rng):
+    counts = {}
+
+    def ingest(word):
+        counts[word] = counts.get(word, 0) + 1
+
+    return {
+        "ingest": time_ops(ingest, keys),
+        "find": time_ops(counts.get, probes),
+        "delete": time_ops(lambda word: counts.pop(word, None), probes),
+    }
+
+def build_rbtree(keys):
+    tree = RedBlackTree(verbose=False)
+    for key in keys:
+        tree.insert(key)
+    return tree
+
+def bench_rbtree(keys, probes, rng):
+    tree = RedBlackTree(verbose=False)
+    return {
+        "insert": time_ops(tree.insert, keys),
+        "search": time_ops(tree.search, probes),
+        "sort": time_once(tree.sort),
+        "delete": time_ops(tree.delete, probes),
+    }
+
+def build_skiplist(keys):
+    sl = SkipList(max_level=max(4, len(keys).bit_length()), verbose=False)
+    for key in keys:
+        sl.insert(key)
+    return sl
+
+def bench_skiplist(keys, probes, rng):
+    sl = SkipList(max_level=max(4, len(keys).bit_length()), verbose=False)
+    return {
+        "insert": time_ops(sl.insert, keys),
+        "search": time_ops(sl.search, probes),
+        "delete": time_ops(sl.delete, probes),
+    }
+
+# Above this size bisect.insort is O(n^2) overall, so the sorted-list baseline is built with
+# sorted() instead and reports a one-shot "build" in place of per-key "insert"
+BISECT_INSORT_LIMIT = 10**5
+
+def build_bisect(keys):
+    if len(keys) > BISECT_INSORT_LIMIT:
+        return sorted(keys)
+    items = []
+    for key in keys:
+        bisect.insort(items, key)
+    return items
+
+def bench_bisect(keys, probes, rng):
+    items = []
+
+    def search(key):
+        i = bisect.bisect_left(items, key)
+        return i < len(items) and items[i] == key
+
+    def delete(key):
+        i = bisect.bisect_left(items, key)
+        if i < len(items) and items[i] == key:
+            del items[i]
+
+    if len(keys) > BISECT_INSORT_LIMIT:
+        build_stats = {"build": time_once(lambda: items.extend(sorted(keys)))}
+    else:
+        build_stats = {"insert": time_ops(lambda key: bisect.insort(items, key), keys)}
+    return {
+        **build_stats,
+        "search": time_ops(search, probes),
+        "sort": time_once(lambda: list(items)),
+        "delete": time_ops(delete, probes),
+    }
+
+def build_binomial(keys):
+    heap = BinomialHeap()
+    for key in keys:
+        heap.insert(key)
+    return heap
+
+def bench_binomial(keys, probes, rng):
+    heap = BinomialHeap()
+    handles = []
+    insert_stats = time_ops(lambda key: handles.append(heap.insert(key)), keys)
+    chosen = rng.sample(handles, len(probes))
+    return {
+        "insert": insert_stats,
+        "decrease_key": time_ops(lambda node: heap.decrease_key(node, node.key - rng.randint(1, 100)), chosen),
+        "extract_min": time_ops(lambda _: heap.extract_min(), probes),
+    }
+
+def build_heapq(keys):
+    queue = []
+    for key in keys:
+        heapq.heappush(queue, key)
+    return queue
+
+def bench_heapq(keys, probes, rng):
+    queue = []
+    entries = []
+
+    def push(key):
+        entry = [key, True]
+        entries.append(entry)
+        heapq.heappush(queue, entry)
+
+    def decrease_key(entry):
+        # Lazy deletion: invalidate the old entry and push a new one
+        entry[1] = False
+        push(entry[0] - rng.randint(1, 100))
+
+    def pop(_):
+        while not heapq.heappop(queue)[1]:
+            pass
+
+    insert_stats = time_ops(push, keys)
+    chosen = rng.sample(entries, len(probes))
+    return {
+        "insert": insert_stats,
+        "decrease_key": time_ops(decrease_key, chosen),
+        "extract_min": time_ops(pop, probes),
+    }
+
+# structure name -> (key kind, build, bench)
+CASES = {
+    "WordCountHash": ("word", build_hash, bench_hash),
+    "dict": ("word", build_dict, bench_dict),
+    "RedBlackTree": ("int", build_rbtree, bench_rbtree),
+    "SkipList": ("int", build_skiplist, bench_skiplist),
+    "bisect": ("int", build_bisect, bench_bisect),
+    "BinomialHeap": ("int", build_binomial, bench_binomial),
+    "heapq": ("int", build_heapq, bench_heapq),
+}
+
+def make_workload(kind, size, seed, probe_fraction=0.1):
+    """Fixed-seed keys and a sample of them to probe, search and delete"""
+    rng = random.Random(seed)
+    keys = rng.sample(range(size * 10), size)
+    if kind == "word":
+        # Repeat a share of the words so ingest exercises increase as well as insert
+        words = [f"w{key}" for key in keys]
+        keys = words + rng.choices(words, k=size // 4)
+        rng.shuffle(keys)
+    probes = rng.sample(keys, max(1, int(len(keys) * probe_fraction)))
+    return keys, probes
+
+def run(structures, sizes, seed, memory=True, counters=False):
+    results = []
+    for size in sizes:
+        for name in structures:
+            kind, build, bench = CASES[name]
+            keys, probes = make_workload(kind, size, seed)
+            # The latency run and the memory run both start from the same seed, including the
+            # global random module that SkipList.random_level draws from
+            random.seed(seed)
+            if counters:
+                # Counted runs are slower, so their latencies are not comparable with plain runs
+                with instrumentation.profile() as counts:
+                    operations = bench(keys, probes, random.Random(seed))
+            else:
+                operations = bench(keys, probes, random.Random(seed))
+            result = {"structure": name, "size": size, "operations": operations}
+            if counters:
+                result["counters"] = dict(counts)
+            if memory:
+                random.seed(seed)
+                result["peak_bytes"] = peak_memory(build, keys)
+            results.append(result)
+            print(f"{name:>14} n={size}: " + ", ".join(
+                f"{op} {stats['ops_per_sec']:.0f}/s" for op, stats in operations.items()), file=sys.stderr)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the data-structure modules")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**3, 10**4, 10**5],
+                        help="input sizes, e.g. 1000 ... 10000000")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--structures", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak memory pass")
+    parser.add_argument("--counters", action="store_true",
+                        help="also record internal work counts from the instrumentation module")
+    parser.add_argument("--node-layout", type=int, metavar="N",
+                        help="also compare slotted vs __dict__ SkipList nodes at N keys (e.g. 1000000)")
+    parser.add_argument("--dijkstra", type=int, metavar="N",
+                        help="also time Dijkstra with BinomialHeap vs heapq on an N-vertex graph (e.g. 100000)")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "seed": args.seed,
+            "counters": args.counters,
+            "sizes": args.sizes,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": run(args.structures, args.sizes, args.seed, memory=not args.no_memory,
+                       counters=args.counters),
+    }
+    # Standalone module benchmarks, run only when asked for; their progress output goes
+    # to stderr like run()'s so stdout stays valid JSON
+    extras = {}
+    with contextlib.redirect_stdout(sys.stderr):
+        if args.node_layout:
+            extras["node_layout"] = {"size": args.node_layout,
+                                     "layouts": benchmark_node_layout(args.node_layout, seed=args.seed)}
+        if args.dijkstra:
+            avg_degree = 8
+            extras["dijkstra"] = {"vertices": args.dijkstra, "edges": args.dijkstra * avg_degree,
+                                  "seconds": benchmark_dijkstra(args.dijkstra, avg_degree, seed=args.seed)}
+    if extras:
+        report["extras"] = extras
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+if __name__ == "__main__":
+    main()
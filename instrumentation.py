@@ -0,0 +1,51 @@
+"""Opt-in counters for the internal work done by the data structures.
+
+While disabled, `counters` is None and each instrumented operation pays one
+attribute lookup at entry plus a local None check where it would count.
+While enabled it is a Counter keyed by "<structure>.<event>", e.g.
+"skiplist.hops" or "rbtree.rotations", alongside one "<structure>.<op>"
+entry per call so per-operation averages can be derived.
+
+    with instrumentation.profile() as counts:
+        run_workload()
+    print(counts["rbtree.rotations"] / counts["rbtree.insert"])
+"""
+from collections import Counter
+from contextlib import contextmanager
+
+counters = None
+
+def enable():
+    """Start counting (keeps existing counts if already enabled)"""
+    global counters
+    if counters is None:
+        counters = Counter()
+
+def disable():
+    """Stop counting and drop the counts"""
+    global counters
+    counters = None
+
+def reset():
+    """Zero the counts without disabling"""
+    if counters is not None:
+        counters.clear()
+
+def snapshot():
+    """Copy of the current counts ({} when disabled)"""
+    return dict(counters) if counters is not None else {}
+
+@contextmanager
+def profile():
+    """Count only the work done inside the block. The yielded Counter keeps
+    its totals after the block; an enclosing profile also receives them."""
+    global counters
+    previous = counters
+    counters = Counter()
+    current = counters
+    try:
+        yield current
+    finally:
+        counters = previous
+        if previous is not None:
+            previous.update(current)